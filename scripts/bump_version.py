@@ -3,53 +3,68 @@
 bump_version.py - Update version across all package files
 """
 
-import re
 import sys
-import json
+
+# One-shot script: don't write __pycache__ for anything imported below
+sys.dont_write_bytecode = True
+
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+# Patterns are compiled once at import time
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+$')
+_CARGO_VERSION_RE = re.compile(rb'^version = "([^"]*)"', re.MULTILINE)
+_SETUP_VERSION_RE = re.compile(rb'version="([^"]*)"')
+_PKG_VERSION_RE = re.compile(rb'"version"\s*:\s*"([^"]*)"')
 
-def update_cargo_toml(version: str, root: Path) -> None:
+
+def update_cargo_toml(version: str, root: Path) -> str:
     """Update version in Cargo.toml"""
     cargo_path = root / "Cargo.toml"
-    content = cargo_path.read_text()
-    updated = re.sub(
-        r'^version = "[^"]*"',
-        f'version = "{version}"',
-        content,
-        count=1,
-        flags=re.MULTILINE
-    )
-    cargo_path.write_text(updated)
-    print(f"✓ Updated {cargo_path}")
+    content = cargo_path.read_bytes()
+    match = _CARGO_VERSION_RE.search(content)
+    if match is None:
+        raise ValueError(f'No version field in {cargo_path}')
+    if match.group(1) == version.encode():
+        # Skip the write so cargo doesn't see a new mtime
+        return f"= {cargo_path} already at {version}"
+    updated = _CARGO_VERSION_RE.sub(f'version = "{version}"'.encode(), content, count=1)
+    cargo_path.write_bytes(updated)
+    return f"✓ Updated {cargo_path}"
 
 
-def update_setup_py(version: str, root: Path) -> None:
+def update_setup_py(version: str, root: Path) -> str:
     """Update version in bindings/python/setup.py"""
     setup_path = root / "bindings" / "python" / "setup.py"
-    content = setup_path.read_text()
-    updated = re.sub(
-        r'version="[^"]*"',
-        f'version="{version}"',
-        content
-    )
-    setup_path.write_text(updated)
-    print(f"✓ Updated {setup_path}")
+    content = setup_path.read_bytes()
+    current = _SETUP_VERSION_RE.findall(content)
+    if not current:
+        raise ValueError(f'No version= argument in {setup_path}')
+    if all(v == version.encode() for v in current):
+        return f"= {setup_path} already at {version}"
+    updated = _SETUP_VERSION_RE.sub(f'version="{version}"'.encode(), content)
+    setup_path.write_bytes(updated)
+    return f"✓ Updated {setup_path}"
 
 
-def update_package_json(version: str, root: Path, path: Path) -> None:
+def update_package_json(version: str, root: Path, path: Path) -> str:
     """Update version in a package.json file"""
     pkg_path = root / path / "package.json"
-    with open(pkg_path, 'r') as f:
-        data = json.load(f)
+    data = pkg_path.read_bytes()
+    
+    match = _PKG_VERSION_RE.search(data)
+    if match is None:
+        raise ValueError(f'No "version" field in {pkg_path}')
+    if match.group(1) == version.encode():
+        return f"= {pkg_path} already at {version}"
     
-    data['version'] = version
+    # Edit the first "version" value in place so formatting and key order are untouched
+    updated = data[:match.start(1)] + version.encode() + data[match.end(1):]
     
-    with open(pkg_path, 'w') as f:
-        json.dump(data, f, indent=2)
-        f.write('\n')  # Add trailing newline
+    pkg_path.write_bytes(updated)
     
-    print(f"✓ Updated {pkg_path}")
+    return f"✓ Updated {pkg_path}"
 
 
 def main():
@@ -60,7 +75,7 @@ def main():
     version = sys.argv[1]
     
     # Validate version format (basic semver)
-    if not re.match(r'^\d+\.\d+\.\d+$', version):
+    if not _SEMVER_RE.match(version):
         print(f"x Invalid version format: {version}")
         print("Expected format: X.Y.Z (e.g., 0.1.0)")
         sys.exit(1)
@@ -70,38 +85,52 @@ def main():
     print(f"\nBumping version to {version}...")
     print()
     
-    try:
-        # Update Cargo.toml
-        update_cargo_toml(version, root)
-        
-        # Update Python setup.py
-        update_setup_py(version, root)
-        
-        # Update npm package.json
-        update_package_json(version, root, Path("pkg"))
-        
-        # Update VS Code extension package.json
-        update_package_json(version, root, Path("vscode-extension"))
-        
-        print()
-        print(f"Version bumped to {version}")
-        print()
-        print("Next steps:")
-        print("  1. Review changes: git diff")
-        print(f"  2. Commit: git commit -am 'chore: bump version to {version}'")
-        print(f"  3. Tag: git tag v{version}")
-        print("  4. Push: git push origin main --tags")
+    # Files are independent, so update them concurrently
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futs = [
+            # Cargo.toml
+            ex.submit(update_cargo_toml, version, root),
+            # Python setup.py
+            ex.submit(update_setup_py, version, root),
+            # npm package.json
+            ex.submit(update_package_json, version, root, Path("pkg")),
+            # VS Code extension package.json
+            ex.submit(update_package_json, version, root, Path("vscode-extension")),
+        ]
+        # Let every update finish so the report covers each file that was touched
+        wait(futs)
+    
+    # Report in submission order
+    failed = False
+    missing = False
+    for f in futs:
+        exc = f.exception()
+        if exc is None:
+            print(f.result())
+        elif isinstance(exc, FileNotFoundError):
+            print(f"x Error: {exc}")
+            failed = missing = True
+        else:
+            print(f"x Unexpected error: {exc}")
+            failed = True
+    
+    if failed:
         print()
-        print("GitHub Actions will automatically publish to PyPI and npm when you push the tag.")
-        
-    except FileNotFoundError as e:
-        print(f"x Error: {e}")
-        print("Make sure you're running this from the repository root.")
+        print("Some files were not updated; the ones marked ✓ above were changed.")
+        if missing:
+            print("Make sure you're running this from the repository root.")
         sys.exit(1)
-    except Exception as e:
-        print(f"x Unexpected error: {e}")
-        sys.exit(1)
-
+    
+    print()
+    print(f"Version bumped to {version}")
+    print()
+    print("Next steps:")
+    print("  1. Review changes: git diff")
+    print(f"  2. Commit: git commit -am 'chore: bump version to {version}'")
+    print(f"  3. Tag: git tag v{version}")
+    print("  4. Push: git push origin main --tags")
+    print()
+    print("GitHub Actions will automatically publish to PyPI and npm when you push the tag.")
 
 if __name__ == "__main__":
     main()